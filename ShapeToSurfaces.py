@@ -14,6 +14,12 @@ if app:
 newComp = None
 shapeToSurfacePanel =None
 
+# attributes used to tag everything a slice run creates, so the next run can find and replace it
+attributeGroup = 'ShapeToSurfaces'
+attributeName = 'sliceRun'
+outputRole = 'output'
+sourceRole = 'source'
+
 def createNewComponent():
     # Get the active design.
     product = app.activeProduct
@@ -132,6 +138,7 @@ class ShapeToSurfaceCommandExecuteHandler(adsk.core.CommandEventHandler):
                 if numContoursInput.value != '':
                     numContours = int(numContoursInput.value)
 
+            purgePreviousRun(design)
             createPlane(layerHeight, numContours, contWidth)
             design.designType = adsk.fusion.DesignTypes.ParametricDesignType
         
@@ -139,22 +146,52 @@ class ShapeToSurfaceCommandExecuteHandler(adsk.core.CommandEventHandler):
             design = activeDoc.design       
             rootComp = design.rootComponent     
 
+            #only the source bodies are left to hide, the generated sketches are hidden as they are made
             bodies = rootComp.bRepBodies
-            sketches= rootComp.sketches
             for body in bodies:
-                body.isLightBulbOn=False
-            for sketch in sketches:
-                sketch.isVisible=False
+                if body.isVisible:
+                    tagEntity(body, sourceRole)
+                    body.isLightBulbOn=False
         except:
             if ui:
                 ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
 
+def tagEntity(entity, role):
+    #mark the entity as belonging to a slice run
+    attribute = entity.attributes.itemByName(attributeGroup, attributeName)
+    if attribute:
+        attribute.value = role
+    else:
+        entity.attributes.add(attributeGroup, attributeName, role)
+
+
+def purgePreviousRun(design):
+    #delete the planes, sketches and extrusions of the previous run in one operation
+    #and bring its source bodies back so they get sliced again
+    outputEntities = adsk.core.ObjectCollection.create()
+    for attribute in design.findAttributes(attributeGroup, attributeName):
+        entity = attribute.parent
+        if not entity:
+            continue
+        if attribute.value == outputRole:
+            outputEntities.add(entity)
+        elif attribute.value == sourceRole:
+            entity.isLightBulbOn=True
+            attribute.deleteMe()
+
+    if outputEntities.count > 0:
+        design.deleteEntities(outputEntities)
+    return
+
+
 def createPlane(layerHeight, numContours, contWidth):
     activeDoc = adsk.core.Application.get().activeDocument
     design = activeDoc.design       
     rootComp = design.rootComponent     
-    rootComp.occurrences.addNewComponent (adsk.core.Matrix3D.create()).component.name=("extrusions")
+    extrudesOcc = rootComp.occurrences.addNewComponent (adsk.core.Matrix3D.create())
+    extrudesOcc.component.name=("extrusions")
+    tagEntity(extrudesOcc, outputRole)
 
     modelMinZ=rootComp.boundingBox.minPoint.z+0.002
     modelMaxZ=rootComp.boundingBox.maxPoint.z
@@ -165,6 +202,7 @@ def createPlane(layerHeight, numContours, contWidth):
     planeInOff.setByOffset(rootComp.xYConstructionPlane,adsk.core.ValueInput.createByReal(modelMinZ))
     planeMin=planes.add(planeInOff)
     planeMin.isLightBulbOn=False
+    tagEntity(planeMin, outputRole)
     planeHeight = modelMinZ
 
     while planeHeight  <=  modelMaxZ:
@@ -172,6 +210,7 @@ def createPlane(layerHeight, numContours, contWidth):
         offsetValue = adsk.core.ValueInput.createByReal(planeHeight)
         planeInput.setByOffset(rootComp.xYConstructionPlane, offsetValue)
         planeOne = planes.add(planeInput)
+        tagEntity(planeOne, outputRole)
         projectToPlane(planeOne,contWidth,numContours,layerHeight, planeHeight)
         planeHeight+= layerHeight
     
@@ -184,6 +223,7 @@ def projectToPlane(plane, contWidth, numContours, layerHeight, planeHeight):
     rootComp = design.rootComponent
     sketches= rootComp.sketches
     sketch = sketches.add(plane)
+    tagEntity(sketch, outputRole)
     bodies = rootComp.bRepBodies
     for body in bodies:
         bodyMaxZ = body.boundingBox.maxPoint.z
@@ -194,7 +234,7 @@ def projectToPlane(plane, contWidth, numContours, layerHeight, planeHeight):
 
     extrudeSurface(layerHeight,sketch, numContours, contWidth)
     design.activateRootComponent()
-    #sketch.isLightBulbOn=False
+    sketch.isVisible=False
     return
 
 